@@ -1,6 +1,6 @@
 import time
 from fastapi import APIRouter, HTTPException
-from api.utils import convert_image, get_image, read_image
+from api.utils import convert_image, get_image
 from api.schemas.corners_model import CornersModel
 from api.services.corners_service import CornersDetector
 
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, HTTPException
-from api.utils import convert_image, get_image, read_image
+from api.utils import convert_image, get_image
 from api.schemas.edge_model import EdgeModel
 from api.services.edge_service import EdgeDetector
 
@@ -1,7 +1,8 @@
 import os
+from functools import lru_cache
 
 from fastapi import APIRouter, HTTPException
-from api.utils import convert_image, get_image, read_image
+from api.utils import convert_image, get_image
 from api.config import models_folder
 
 from api.schemas.face_model import FaceModel
@@ -13,6 +14,20 @@ router = APIRouter()
 face_options = ["faceDetection", "faceRecognition"]
 
 
+@lru_cache(maxsize=1)
+def get_face_detection():
+    cascade_file = os.path.join(models_folder, "haarcascade_frontalface_default.xml")
+    return FaceDetection(cascade_file)
+
+
+@lru_cache(maxsize=1)
+def get_face_recognition():
+    cascade_file = os.path.join(models_folder, "haarcascade_frontalface_default.xml")
+    svm_file = os.path.join(models_folder, "svm_model.pkl")
+    pca_file = os.path.join(models_folder, "pca.pkl")
+    return FaceRecognition(cascade_file, svm_file, pca_file)
+
+
 @router.post("/face/{image_id}")
 async def detect_recognise_faces(image_id: str, face: FaceModel):
     """
@@ -22,15 +37,10 @@ async def detect_recognise_faces(image_id: str, face: FaceModel):
         raise HTTPException(status_code=400, detail="This option doesn't exist.")
 
     image_path = get_image(image_id)
-    cascade_file = os.path.join(models_folder, "haarcascade_frontalface_default.xml")
     if face.type == "faceDetection":
-        face_detection = FaceDetection(cascade_file)
-        output_image = face_detection.detect_and_draw_faces(image_path)
+        output_image = get_face_detection().detect_and_draw_faces(image_path)
     else:
-        svm_file = os.path.join(models_folder, "svm_model.pkl")
-        pca_file = os.path.join(models_folder, "pca.pkl")
-        face_recognition = FaceRecognition(cascade_file, svm_file, pca_file)
-        output_image = face_recognition.recognize_faces(image_path)
+        output_image = get_face_recognition().recognize_faces(image_path)
 
     output_image = convert_image(output_image)
 
@@ -5,7 +5,6 @@ from api.services.filter_service import Filter
 from api.services.hybrid_service import Hybrid
 from api.utils import convert_image, get_image, read_image
 
-import numpy as np
 
 router = APIRouter()
 
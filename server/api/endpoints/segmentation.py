@@ -1,3 +1,9 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing import get_context
+
 from fastapi import APIRouter, HTTPException
 
 from api.schemas.segmentation_model import SegmentationModel
@@ -8,6 +14,19 @@ router = APIRouter()
 
 segmentation_methods = ["kmeans", "meanShift", "regionGrowing", "agglomerative"]
 
+_executor = None
+
+
+def get_executor():
+    # Spawned (not forked) workers so concurrent segmentation requests run
+    # on separate cores instead of serializing on the uvicorn event loop.
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=os.cpu_count(), mp_context=get_context("spawn")
+        )
+    return _executor
+
 
 @router.post("/segmentation/{image_id}")
 async def apply_segmentation(image_id: str, segmentation: SegmentationModel):
@@ -19,18 +38,22 @@ async def apply_segmentation(image_id: str, segmentation: SegmentationModel):
             status_code=400, detail="Segmentation method doesn't exist."
         )
 
-    image_path = get_image(image_id)
-    segmented_image = None
+    # Decode once up front (read_image caches by image id and mtime) and
+    # hand the pixels to the kernel, so segmenting the same upload several
+    # ways does not re-read or re-decode the file.
+    image = read_image(get_image(image_id))
 
     if segmentation.type == "kmeans":
-        segmented_image = Segmentation.kmeans_segmentation(
-            image_path=image_path,
+        task = partial(
+            Segmentation.kmeans_segmentation,
+            image=image,
             K=segmentation.k,
             max_iterations=segmentation.maxIterations,
         )
     elif segmentation.type == "meanShift":
-        segmented_image = Segmentation.mean_shift_segmentation(
-            image_path=image_path,
+        task = partial(
+            Segmentation.mean_shift_segmentation,
+            image=image,
             window_size=segmentation.windowSize,
             threshold=segmentation.threshold / 100,
         )
@@ -38,17 +61,25 @@ async def apply_segmentation(image_id: str, segmentation: SegmentationModel):
         seed_points = [
             (int(point.y), int(point.x)) for point in segmentation.seedPoints
         ]
-        segmented_image = Segmentation.region_growing_segmentaion(
-            image_path=image_path,
+        task = partial(
+            Segmentation.region_growing_segmentaion,
+            image=image,
             thershold=segmentation.threshold,
             seed_points=seed_points,
         )
     elif segmentation.type == "agglomerative":
-        segmented_image = Segmentation.agglomerative_segmentation(
-            image_path=image_path, number_of_clusters=segmentation.clustersNumber
+        task = partial(
+            Segmentation.agglomerative_segmentation,
+            image=image,
+            number_of_clusters=segmentation.clustersNumber,
         )
 
-    segmented_image = convert_image(segmented_image)
+    loop = asyncio.get_running_loop()
+    segmented_image = await loop.run_in_executor(get_executor(), task)
+    # JPEG encoding releases the GIL, so the default thread pool is enough.
+    segmented_image = await loop.run_in_executor(
+        None, partial(convert_image, segmented_image)
+    )
 
     return {
         "success": True,
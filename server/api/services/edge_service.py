@@ -1,10 +1,21 @@
 import numpy as np
 import cv2
-import skimage.exposure as exposure
 
 from api.utils import read_image
 
 
+def rescale_to_uint8(image):
+    # Map the image's own [min, max] range onto [0, 255]; plain NumPy
+    # replacement for skimage.exposure.rescale_intensity, which pulled in
+    # all of scikit-image for this one rescale.
+    image = image.astype(np.float32)
+    min_value = image.min()
+    value_range = image.max() - min_value
+    if value_range == 0:
+        return np.zeros(image.shape, dtype=np.uint8)
+    return ((image - min_value) * (255.0 / value_range)).astype(np.uint8)
+
+
 def non_maximum_suppression(image, angles):
     size = image.shape
     suppressed = np.zeros(size)
@@ -77,34 +88,16 @@ class EdgeDetector:
         phase[phase < 0] += 180
 
         if direction == "x":
-            sobel_x_normalized = (
-                exposure.rescale_intensity(
-                    sobel_x, in_range="image", out_range=(0, 255)
-                )
-                .clip(0, 255)
-                .astype(np.uint8)
-            )
+            sobel_x_normalized = rescale_to_uint8(sobel_x)
 
             return sobel_x_normalized, phase
         elif direction == "y":
-            sobel_y_normalized = (
-                exposure.rescale_intensity(
-                    sobel_y, in_range="image", out_range=(0, 255)
-                )
-                .clip(0, 255)
-                .astype(np.uint8)
-            )
+            sobel_y_normalized = rescale_to_uint8(sobel_y)
 
             return sobel_y_normalized, phase
         elif direction == "both":
             sobel_magnitude = np.sqrt(np.square(sobel_x) + np.square(sobel_y))
-            sobel_magnitude = (
-                exposure.rescale_intensity(
-                    sobel_magnitude, in_range="image", out_range=(0, 255)
-                )
-                .clip(0, 255)
-                .astype(np.uint8)
-            )
+            sobel_magnitude = rescale_to_uint8(sobel_magnitude)
             return sobel_magnitude, phase
         else:
             raise ValueError("Invalid direction. Please use x, y or both.")
@@ -118,11 +111,7 @@ class EdgeDetector:
         prewitt_x = cv2.filter2D(image, cv2.CV_32F, prewitt_kernel_x)
         prewitt_y = cv2.filter2D(image, cv2.CV_32F, prewitt_kernel_y)
         magnitude = np.sqrt(np.square(prewitt_x) + np.square(prewitt_y))
-        prewitt_magnitude = (
-            exposure.rescale_intensity(magnitude, in_range="image", out_range=(0, 255))
-            .clip(0, 255)
-            .astype(np.uint8)
-        )
+        prewitt_magnitude = rescale_to_uint8(magnitude)
         return prewitt_magnitude
 
     @staticmethod
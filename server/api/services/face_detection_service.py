@@ -8,7 +8,10 @@ class FaceDetection:
         self.face_cascade = cv2.CascadeClassifier(face_cascade_path)
 
     def detect_faces(self, image):
-        gray_image = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+        if image.ndim == 2:
+            gray_image = image
+        else:
+            gray_image = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
         faces = self.face_cascade.detectMultiScale(gray_image, 1.1, 4)
         return faces
 
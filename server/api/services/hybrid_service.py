@@ -1,3 +1,6 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
 import numpy as np
 import cv2
 
@@ -53,8 +56,12 @@ class Hybrid:
 
     @staticmethod
     def apply_mixer(image_1_path: str, image_2_path: str, filter_1: str, radius: int):
-        image_1 = read_image(image_1_path, grayscale=True)
-        image_2 = read_image(image_2_path, grayscale=True)
+        # Decode the two inputs concurrently; cv2.imread releases the GIL
+        # while decompressing.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            image_1, image_2 = executor.map(
+                partial(read_image, grayscale=True), [image_1_path, image_2_path]
+            )
         adjusted_image_1, adjusted_img2 = Hybrid.img_adjustment(image_1, image_2)
         if filter_1 == "high":
             ff_image_1, output_image_1 = Hybrid.apply_high_pass(
@@ -1,7 +1,7 @@
 import cv2
 import numpy as np
 
-from api.utils import read_image
+from api.utils import read_image, template_match_ssd
 
 
 class Matching:
@@ -10,16 +10,9 @@ class Matching:
         image = read_image(image_path)
         template = read_image(template_path, grayscale=True)
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        result_cols = gray.shape[1] - template.shape[1] + 1
-        result_rows = gray.shape[0] - template.shape[0] + 1
-        output = np.zeros((result_rows, result_cols), dtype=np.int32)
-
-        for i in range(result_rows):
-            for j in range(result_cols):
-                roi = gray[i : i + template.shape[0], j : j + template.shape[1]]
-                difference = roi.astype(np.float32) - template.astype(np.float32)
-                result_image = np.square(difference)
-                output[i, j] = np.sum(result_image)
+        output = template_match_ssd(
+            gray.astype(np.float32), template.astype(np.float32)
+        )
 
         _, _, min_loc, _ = cv2.minMaxLoc(output)
         roi = (min_loc[0], min_loc[1], template.shape[1], template.shape[0])
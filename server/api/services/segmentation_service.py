@@ -1,20 +1,17 @@
 import cv2
 import numpy as np
-from numba import prange
 
 from api.utils import (
     agglomerative_clustering,
-    find_nearest_cluster,
+    assign_cluster_labels,
     compute_distances,
     euclidean_distance,
-    read_image,
 )
 
 
 class Segmentation:
     @staticmethod
-    def kmeans_segmentation(image_path: str, K: int, max_iterations: int):
-        image = read_image(image_path)
+    def kmeans_segmentation(image: np.ndarray, K: int, max_iterations: int):
         transformed_image = image.reshape((-1, 3))
         transformed_image = np.float32(transformed_image)
 
@@ -51,8 +48,8 @@ class Segmentation:
         return masked_image
 
     @staticmethod
-    def mean_shift_segmentation(image_path: str, window_size: int, threshold: float):
-        input_image = read_image(image_path)
+    def mean_shift_segmentation(image: np.ndarray, window_size: int, threshold: float):
+        input_image = image
         image_height, image_width, _ = input_image.shape
         segmented_image = np.zeros((image_height, image_width, 3), dtype=np.uint8)
         feature_space = np.zeros((image_height * image_width, 5))
@@ -128,11 +125,11 @@ class Segmentation:
 
     @staticmethod
     def region_growing_segmentaion(
-        image_path: str, thershold: int, seed_points: list[tuple]
+        image: np.ndarray, thershold: int, seed_points: list[tuple]
     ):
         print(seed_points)
-        original_image = read_image(image_path)
-        image_gray = read_image(image_path, grayscale=True)
+        original_image = image
+        image_gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
         _, img = cv2.threshold(image_gray, thershold, 255, cv2.THRESH_BINARY)
         processed = np.full((img.shape[0], img.shape[1]), False)
 
@@ -165,22 +162,13 @@ class Segmentation:
         return image_with_contours
 
     @staticmethod
-    def agglomerative_segmentation(image_path: str, number_of_clusters: int):
-        image = read_image(image_path)
-        segmentedImage = np.zeros(image.shape, dtype=np.uint8)
-
+    def agglomerative_segmentation(image: np.ndarray, number_of_clusters: int):
         clusters = image.reshape(-1, 3)
 
         clusters = agglomerative_clustering(clusters, number_of_clusters)
 
-        # Assign labels to the pixels
-        labels = np.zeros((image.shape[0], image.shape[1]), dtype=np.int32)
-        for i in prange(image.shape[0]):
-            for j in prange(image.shape[1]):
-                labels[i, j] = find_nearest_cluster(image[i, j], clusters)
-
-        for i in prange(image.shape[0]):
-            for j in prange(image.shape[1]):
-                color = clusters[labels[i, j]]
-                segmentedImage[i, j] = color
+        # Assign labels to the pixels in parallel, then recolor with one
+        # gather instead of a second per-pixel loop.
+        labels = assign_cluster_labels(image.reshape(-1, 3), clusters)
+        segmentedImage = clusters[labels].reshape(image.shape).astype(np.uint8)
         return segmentedImage
@@ -1,6 +1,6 @@
 import cv2
 import numpy as np
-from functools import cmp_to_key
+from scipy.ndimage import maximum_filter, minimum_filter
 
 from api.utils import read_image
 
@@ -81,15 +81,18 @@ class SIFT:
         return int(np.round(np.log(min(image_dimensions)) / np.log(2) - 1))
 
     def _get_gaussian_filters_sizes(self):
+        # Each entry past the first is the *incremental* blur
+        # sqrt(sigma_{i+1}^2 - sigma_i^2) applied on top of the previous
+        # scale in _get_pyramids, so kernel radii stay small instead of
+        # re-blurring from scratch with the full sigma at every scale.
         images_per_octave = self.num_intervals + 3
         k_value = 2 ** (1.0 / self.num_intervals)
-        gaussian_filter_sizes = np.zeros(images_per_octave)
+        total_sigmas = self.sigma * k_value ** np.arange(images_per_octave)
+        gaussian_filter_sizes = np.empty(images_per_octave)
         gaussian_filter_sizes[0] = self.sigma
-
-        for index in range(1, images_per_octave):
-            previous_sigma = (k_value ** (index - 1)) * self.sigma
-            total_sigma = k_value * previous_sigma
-            gaussian_filter_sizes[index] = np.sqrt(total_sigma**2 - previous_sigma**2)
+        gaussian_filter_sizes[1:] = np.sqrt(
+            total_sigmas[1:] ** 2 - total_sigmas[:-1] ** 2
+        )
         return gaussian_filter_sizes
 
     def _get_pyramids(self, image_data, octave_count, gaussian_filters):
@@ -104,21 +107,20 @@ class SIFT:
                 octave_images.append(image_data)
             gaussian_pyramid.append(octave_images)
             base_image = octave_images[-3]
-            image_data = cv2.resize(
-                base_image,
-                (int(base_image.shape[1] / 2), int(base_image.shape[0] / 2)),
-                interpolation=cv2.INTER_NEAREST,
-            )
+            # Strided slicing is identical to nearest-neighbour resize for a
+            # fixed factor of 2, without the interpolation pass; copy so the
+            # next octave works on a contiguous array.
+            image_data = np.ascontiguousarray(base_image[::2, ::2])
         return np.array(gaussian_pyramid, dtype=object)
 
     def _get_dog(self, pyramids):
         dog_pyramid = []
 
         for octave_images in pyramids:
-            dog_images_in_octave = []
-            for first_img, second_img in zip(octave_images, octave_images[1:]):
-                dog_images_in_octave.append(cv2.subtract(second_img, first_img))
-            dog_pyramid.append(dog_images_in_octave)
+            # One fused pass over the stacked octave instead of a Python
+            # loop of pairwise subtractions.
+            stacked_octave = np.stack(octave_images).astype(np.float32, copy=False)
+            dog_pyramid.append(list(np.diff(stacked_octave, axis=0)))
         return np.array(dog_pyramid, dtype=object)
 
     def _detect_scale_space_extrema(
@@ -137,68 +139,55 @@ class SIFT:
             for image_index, (first_img, second_img, third_img) in enumerate(
                 zip(dog_octave, dog_octave[1:], dog_octave[2:])
             ):
-                for x in range(border_width, first_img.shape[0] - border_width):
-                    for y in range(border_width, first_img.shape[1] - border_width):
-                        if self._check_pixel_extremum(
-                            first_img[x - 1 : x + 2, y - 1 : y + 2],
-                            second_img[x - 1 : x + 2, y - 1 : y + 2],
-                            third_img[x - 1 : x + 2, y - 1 : y + 2],
-                            threshold_value,
-                        ):
-                            extremum_result = self._localize_extremum_via_quadratic_fit(
-                                x,
-                                y,
-                                image_index + 1,
+                candidate_mask = self._find_extremum_candidates(
+                    first_img, second_img, third_img, threshold_value, border_width
+                )
+                for x, y in np.argwhere(candidate_mask):
+                    extremum_result = self._localize_extremum_via_quadratic_fit(
+                        int(x),
+                        int(y),
+                        image_index + 1,
+                        octave_index,
+                        interval_count,
+                        dog_octave,
+                        sigma_value,
+                        contrast_threshold,
+                        border_width,
+                    )
+                    if extremum_result is not None:
+                        keypoint, localized_image_index = extremum_result
+                        keypoints_with_orientations = (
+                            self._compute_keypoints_with_orientations(
+                                keypoint,
                                 octave_index,
-                                interval_count,
-                                dog_octave,
-                                sigma_value,
-                                contrast_threshold,
-                                border_width,
+                                gaussian_pyramid[octave_index][localized_image_index],
                             )
-                            if extremum_result is not None:
-                                keypoint, localized_image_index = extremum_result
-                                keypoints_with_orientations = (
-                                    self._compute_keypoints_with_orientations(
-                                        keypoint,
-                                        octave_index,
-                                        gaussian_pyramid[octave_index][
-                                            localized_image_index
-                                        ],
-                                    )
-                                )
-                                for (
-                                    keypoint_with_orientation
-                                ) in keypoints_with_orientations:
-                                    found_keypoints.append(keypoint_with_orientation)
+                        )
+                        for keypoint_with_orientation in keypoints_with_orientations:
+                            found_keypoints.append(keypoint_with_orientation)
         return found_keypoints
 
-    def _check_pixel_extremum(
-        self, first_subimage, second_subimage, third_subimage, threshold
+    def _find_extremum_candidates(
+        self, first_img, second_img, third_img, threshold, border_width
     ):
-        center_pixel_value = second_subimage[1, 1]
-
-        if abs(center_pixel_value) <= threshold:
-            return False
-
-        if center_pixel_value > 0:
-            return (
-                np.all(center_pixel_value >= first_subimage)
-                and np.all(center_pixel_value >= third_subimage)
-                and np.all(center_pixel_value >= second_subimage[0, :])
-                and np.all(center_pixel_value >= second_subimage[2, :])
-                and center_pixel_value >= second_subimage[1, 0]
-                and center_pixel_value >= second_subimage[1, 2]
-            )
-        elif center_pixel_value < 0:
-            return (
-                np.all(center_pixel_value <= first_subimage)
-                and np.all(center_pixel_value <= third_subimage)
-                and np.all(center_pixel_value <= second_subimage[0, :])
-                and np.all(center_pixel_value <= second_subimage[2, :])
-                and center_pixel_value <= second_subimage[1, 0]
-                and center_pixel_value <= second_subimage[1, 2]
-            )
+        # Per-pixel 3x3x3 max/min over the three DoG scales in two C calls;
+        # a pixel is a candidate when it equals the neighbourhood max (or
+        # min) and clears the contrast threshold.
+        scale_cube = np.stack([first_img, second_img, third_img]).astype(
+            np.float32, copy=False
+        )
+        center = scale_cube[1]
+        local_max = maximum_filter(scale_cube, size=3)[1]
+        local_min = minimum_filter(scale_cube, size=3)[1]
+        candidate_mask = (np.abs(center) > threshold) & (
+            ((center > 0) & (center >= local_max))
+            | ((center < 0) & (center <= local_min))
+        )
+        candidate_mask[:border_width] = False
+        candidate_mask[-border_width:] = False
+        candidate_mask[:, :border_width] = False
+        candidate_mask[:, -border_width:] = False
+        return candidate_mask
 
     def _localize_extremum_via_quadratic_fit(
         self,
@@ -430,27 +419,25 @@ class SIFT:
 
         return keypoints_with_orientations
 
-    def _compare_keypoints(self, keypoint1, keypoint2):
-        if keypoint1.pt[0] != keypoint2.pt[0]:
-            return keypoint1.pt[0] - keypoint2.pt[0]
-        if keypoint1.pt[1] != keypoint2.pt[1]:
-            return keypoint1.pt[1] - keypoint2.pt[1]
-        if keypoint1.size != keypoint2.size:
-            return keypoint2.size - keypoint1.size
-        if keypoint1.angle != keypoint2.angle:
-            return keypoint1.angle - keypoint2.angle
-        if keypoint1.response != keypoint2.response:
-            return keypoint2.response - keypoint1.response
-        if keypoint1.octave != keypoint2.octave:
-            return keypoint2.octave - keypoint1.octave
-
-        return keypoint2.class_id - keypoint1.class_id
+    def _keypoint_sort_key(self, keypoint):
+        # Same ordering the old cmp_to_key comparator produced, expressed as
+        # a tuple key so each keypoint is inspected once instead of once per
+        # comparison.
+        return (
+            keypoint.pt[0],
+            keypoint.pt[1],
+            -keypoint.size,
+            keypoint.angle,
+            -keypoint.response,
+            -keypoint.octave,
+            -keypoint.class_id,
+        )
 
     def _remove_duplicate_keypoints(self, keypoints):
         if len(keypoints) < 2:
             return keypoints
 
-        keypoints.sort(key=cmp_to_key(self._compare_keypoints))
+        keypoints.sort(key=self._keypoint_sort_key)
         unique_keypoints = [keypoints[0]]
 
         for next_keypoint in keypoints[1:]:
@@ -636,25 +623,41 @@ class SIFT:
     def match_features(
         original_image_descriptors, template_image_descriptors, matching_method
     ):
-        original_image_keypoints = original_image_descriptors.shape[0]
-        template_image_keypoints = template_image_descriptors.shape[0]
+        original = np.ascontiguousarray(original_image_descriptors, dtype=np.float32)
+        template = np.ascontiguousarray(template_image_descriptors, dtype=np.float32)
+
+        if matching_method is SIFT.ncc_matching:
+            original_norm = (
+                original - original.mean(axis=1, keepdims=True)
+            ) / original.std(axis=1, keepdims=True)
+            template_norm = (
+                template - template.mean(axis=1, keepdims=True)
+            ) / template.std(axis=1, keepdims=True)
+            scores = (template_norm @ original_norm.T) / original.shape[1]
+        elif matching_method is SIFT.ssd_matching:
+            # ||t - o||^2 = ||t||^2 + ||o||^2 - 2 t.o computed with one GEMM;
+            # negated so that argmax picks the closest descriptor, matching
+            # the sign convention of ssd_matching.
+            squared_distances = (
+                (template**2).sum(axis=1)[:, None]
+                + (original**2).sum(axis=1)[None, :]
+                - 2.0 * (template @ original.T)
+            )
+            scores = -np.sqrt(np.maximum(squared_distances, 0))
+        else:
+            scores = np.array(
+                [
+                    [matching_method(t, o) for o in original]
+                    for t in template
+                ]
+            )
 
         matchings = []
-        for teamplate_keypoint in range(template_image_keypoints):
-            distance = -np.inf
-            y_index = -1
-            for original_keypoint in range(original_image_keypoints):
-                value = matching_method(
-                    template_image_descriptors[teamplate_keypoint],
-                    original_image_descriptors[original_keypoint],
-                )
-                if value > distance:
-                    distance = value
-                    y_index = original_keypoint
+        for template_keypoint, original_keypoint in enumerate(scores.argmax(axis=1)):
             matching = cv2.DMatch()
-            matching.queryIdx = teamplate_keypoint
-            matching.trainIdx = y_index
-            matching.distance = distance
+            matching.queryIdx = template_keypoint
+            matching.trainIdx = int(original_keypoint)
+            matching.distance = float(scores[template_keypoint, original_keypoint])
             matchings.append(matching)
         matchings = sorted(matchings, key=lambda x: x.distance, reverse=True)
         return matchings
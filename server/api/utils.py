@@ -1,5 +1,6 @@
 import os
 from fastapi import HTTPException
+from functools import lru_cache
 import cv2
 import numpy as np
 from numba import jit, prange
@@ -17,7 +18,8 @@ def generate_image_id():
     return imageID
 
 
-def read_image(image_path: str, grayscale=False):
+@lru_cache(maxsize=32)
+def _decode_image(image_path: str, grayscale: bool, mtime: float):
     if grayscale:
         image = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
     else:
@@ -26,6 +28,14 @@ def read_image(image_path: str, grayscale=False):
     return image
 
 
+def read_image(image_path: str, grayscale=False):
+    # A typical UI flow applies several operations to the same upload
+    # back to back, so cache the decoded pixels keyed by mtime. Hand back
+    # a copy because callers draw on the returned image in place.
+    image = _decode_image(image_path, grayscale, os.path.getmtime(image_path))
+    return image.copy()
+
+
 def get_image(image_id):
     image_path = None
 
@@ -103,12 +113,28 @@ def hex_to_rgb(hex_color):
     return tuple(int(hex_color[i : i + 2], 16) for i in (0, 2, 4))
 
 
-@jit(nopython=True)
+@jit(nopython=True, cache=True)
 def euclidean_distance(point1, point2):
     return np.sqrt(np.sum((point1 - point2) ** 2))
 
 
-@jit(nopython=True, parallel=True)
+@jit(nopython=True, parallel=True, fastmath=True, cache=True)
+def template_match_ssd(gray, template):
+    result_rows = gray.shape[0] - template.shape[0] + 1
+    result_cols = gray.shape[1] - template.shape[1] + 1
+    output = np.zeros((result_rows, result_cols), dtype=np.float32)
+    for i in prange(result_rows):
+        for j in range(result_cols):
+            ssd = np.float32(0.0)
+            for r in range(template.shape[0]):
+                for c in range(template.shape[1]):
+                    difference = gray[i + r, j + c] - template[r, c]
+                    ssd += difference * difference
+            output[i, j] = ssd
+    return output
+
+
+@jit(nopython=True, parallel=True, cache=True)
 def compute_distances(feature_space, current_mean_array):
     distances = np.zeros(feature_space.shape[0])
     for i in prange(len(feature_space)):
@@ -119,34 +145,41 @@ def compute_distances(feature_space, current_mean_array):
     return distances
 
 
-@jit(nopython=True)  # Apply Numba JIT optimization
+@jit(nopython=True, cache=True)  # Apply Numba JIT optimization
 def find_thresholds(histogram, global_mean_intensity):
-    max_variance = 0
+    # Prefix sums make each (low, high) candidate O(1) instead of re-summing
+    # three histogram slices per pair.
+    histogram = histogram.astype(np.float64)
+    cumulative_counts = np.cumsum(histogram)
+    cumulative_intensity = np.cumsum(np.arange(256) * histogram)
+    total_count = cumulative_counts[-1]
+    total_intensity = cumulative_intensity[-1]
+
+    max_variance = 0.0
     optimal_high_threshold, optimal_low_threshold = 0, 0
     for high_threshold in range(1, 256):
         for low_threshold in range(1, high_threshold):
+            low_count = cumulative_counts[low_threshold - 1]
+            high_count = cumulative_counts[high_threshold - 1]
             weights = np.array(
                 [
-                    histogram[:low_threshold].sum(),
-                    histogram[low_threshold:high_threshold].sum(),
-                    histogram[high_threshold:].sum(),
-                ],
-                dtype=np.float64,
+                    low_count,
+                    high_count - low_count,
+                    total_count - high_count,
+                ]
+            )
+            low_intensity = cumulative_intensity[low_threshold - 1]
+            high_intensity = cumulative_intensity[high_threshold - 1]
+            means = (
+                np.array(
+                    [
+                        low_intensity,
+                        high_intensity - low_intensity,
+                        total_intensity - high_intensity,
+                    ]
+                )
+                / (weights + 1e-6)
             )
-            means = np.array(
-                [
-                    np.sum(np.arange(low_threshold) * histogram[:low_threshold])
-                    / (np.sum(histogram[:low_threshold]) + 1e-6),
-                    np.sum(
-                        np.arange(low_threshold, high_threshold)
-                        * histogram[low_threshold:high_threshold]
-                    )
-                    / (np.sum(histogram[low_threshold:high_threshold]) + 1e-6),
-                    np.sum(np.arange(high_threshold, 256) * histogram[high_threshold:])
-                    / (np.sum(histogram[high_threshold:]) + 1e-6),
-                ],
-                dtype=np.float64,
-            )  # Cast to float64
             variance = np.dot(weights, (means - global_mean_intensity) ** 2)
             if variance > max_variance:
                 max_variance = variance
@@ -157,14 +190,14 @@ def find_thresholds(histogram, global_mean_intensity):
     return optimal_low_threshold, optimal_high_threshold
 
 
-@jit(nopython=True)
+@jit(nopython=True, cache=True)
 def calculate_distance(a, b):
     return np.sqrt(
         np.power(a[0] - b[0], 2) + np.power(a[1] - b[1], 2) + np.power(a[2] - b[2], 2)
     )
 
 
-@jit(nopython=True)
+@jit(nopython=True, cache=True)
 def merge_clusters(a, b):
     r = (a[0] + b[0]) // 2
     g = (a[1] + b[1]) // 2
@@ -172,7 +205,7 @@ def merge_clusters(a, b):
     return (r, g, b)
 
 
-@jit(nopython=True, parallel=True)
+@jit(nopython=True, parallel=True, cache=True)
 def find_closest_clusters(clusters):
     min_dist = 1e10  # A large float value
     min_i, min_j = 0, 0
@@ -185,7 +218,7 @@ def find_closest_clusters(clusters):
     return min_i, min_j
 
 
-@jit(nopython=True)
+@jit(nopython=True, cache=True)
 def find_nearest_cluster(pixel, clusters):
     min_cluster = 0
     min_dist = 1e10  # A large float value
@@ -197,8 +230,17 @@ def find_nearest_cluster(pixel, clusters):
     return min_cluster
 
 
+@jit(nopython=True, parallel=True, cache=True)
+def assign_cluster_labels(pixels, clusters):
+    labels = np.zeros(pixels.shape[0], dtype=np.int32)
+    for i in prange(pixels.shape[0]):
+        labels[i] = find_nearest_cluster(pixels[i], clusters)
+    return labels
+
+
 @jit(
     nopython=True,
+    cache=True,
 )
 def agglomerative_clustering(clusters, number_of_clusters):
     while len(clusters) > number_of_clusters: